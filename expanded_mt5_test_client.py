@@ -65,12 +65,23 @@ class MT5TCPClient:
         # Threading
         self.heartbeat_thread = None
         self.listener_thread = None
+        self.tick_dispatcher_thread = None
         self.running = False
         
+        # Streaming de preços (modo push com conflação por símbolo)
+        self.subscriptions = set()
+        self.tick_gaps: Dict[str, int] = {}
+        self._tick_lock = threading.Lock()
+        self._tick_event = threading.Event()
+        self._tick_seq: Dict[str, int] = {}
+        self._latest_ticks: Dict[str, Dict[str, Any]] = {}
+        self._pending_ticks: Dict[str, Dict[str, Any]] = {}
+        
         # Callbacks
         self.message_callbacks = []
         self.error_callbacks = []
         self.connection_callbacks = []
+        self.tick_callbacks = []
         
         logger.info(f"MT5 TCP Client inicializado - {host}:{port}")
     
@@ -98,6 +109,12 @@ class MT5TCPClient:
             logger.info("Conectado com sucesso ao servidor MT5")
             self._notify_connection_callbacks(True)
             
+            # Restaurar assinaturas após reconexão (o servidor aceita ou
+            # rejeita cada símbolo individualmente na resposta)
+            if self.subscriptions:
+                self._reset_tick_state(self.subscriptions)
+                self.send_command("subscribe", {"symbols": sorted(self.subscriptions)})
+            
             return True
             
         except Exception as e:
@@ -122,6 +139,8 @@ class MT5TCPClient:
                 pass
             self.socket = None
         
+        self._reset_tick_state()
+        
         # Aguardar threads terminarem
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
             self.heartbeat_thread.join(timeout=2)
@@ -129,12 +148,16 @@ class MT5TCPClient:
         if self.listener_thread and self.listener_thread.is_alive():
             self.listener_thread.join(timeout=2)
         
+        if self.tick_dispatcher_thread and self.tick_dispatcher_thread.is_alive():
+            self._tick_event.set()
+            self.tick_dispatcher_thread.join(timeout=2)
+        
         logger.info("Desconectado do servidor")
         self._notify_connection_callbacks(False)
     
     def _start_threads(self):
         """
-        Iniciar threads de heartbeat e listener
+        Iniciar threads de heartbeat, listener e despacho de ticks
         """
         # Thread de heartbeat
         self.heartbeat_thread = threading.Thread(target=self._heartbeat_worker, daemon=True)
@@ -143,6 +166,11 @@ class MT5TCPClient:
         # Thread de listener
         self.listener_thread = threading.Thread(target=self._message_listener, daemon=True)
         self.listener_thread.start()
+        
+        # Thread de despacho de ticks
+        if not self.tick_dispatcher_thread or not self.tick_dispatcher_thread.is_alive():
+            self.tick_dispatcher_thread = threading.Thread(target=self._tick_dispatcher, daemon=True)
+            self.tick_dispatcher_thread.start()
     
     def _heartbeat_worker(self):
         """
@@ -178,6 +206,7 @@ class MT5TCPClient:
                 if not data:
                     logger.warning("Servidor desconectou")
                     self.connected = False
+                    self._reset_tick_state()
                     if self.auto_reconnect:
                         self._attempt_reconnect()
                     break
@@ -195,6 +224,7 @@ class MT5TCPClient:
             except Exception as e:
                 logger.error(f"Erro ao receber mensagem: {e}")
                 self.connected = False
+                self._reset_tick_state()
                 if self.auto_reconnect:
                     self._attempt_reconnect()
                 break
@@ -208,6 +238,15 @@ class MT5TCPClient:
         """
         try:
             data = json.loads(message)
+            
+            # Ticks do streaming não passam pelos callbacks de mensagem
+            if data.get('action') == 'tick':
+                self._handle_tick(data.get('data', {}))
+                return
+            
+            if data.get('action') in ('subscribed', 'unsubscribed'):
+                self._handle_subscription_reply(data)
+            
             logger.debug(f"Mensagem recebida: {data}")
             
             # Notificar callbacks
@@ -218,10 +257,103 @@ class MT5TCPClient:
         except Exception as e:
             logger.error(f"Erro ao processar mensagem: {e}")
     
+    def _handle_tick(self, tick: Dict[str, Any]):
+        """
+        Registrar tick recebido do streaming
+        
+        Apenas o tick mais recente de cada símbolo fica pendente para
+        despacho (conflação), e lacunas na sequência são contabilizadas.
+        
+        Args:
+            tick (Dict): Dados do tick (symbol, bid, ask, seq, ...)
+        """
+        symbol = tick.get('symbol')
+        seq = tick.get('seq')
+        if not symbol or seq is None:
+            logger.error(f"Tick inválido recebido: {tick}")
+            return
+        
+        with self._tick_lock:
+            if symbol not in self.subscriptions:
+                return
+            
+            last_seq = self._tick_seq.get(symbol)
+            if last_seq is not None:
+                if seq <= last_seq:
+                    # Tick duplicado ou fora de ordem
+                    return
+                if seq > last_seq + 1:
+                    missed = seq - last_seq - 1
+                    self.tick_gaps[symbol] = self.tick_gaps.get(symbol, 0) + missed
+                    logger.warning(f"Lacuna no streaming de {symbol}: {missed} tick(s) perdido(s) "
+                                   f"(seq {last_seq} -> {seq})")
+            
+            self._tick_seq[symbol] = seq
+            self._latest_ticks[symbol] = tick
+            self._pending_ticks[symbol] = tick
+        
+        self._tick_event.set()
+    
+    def _handle_subscription_reply(self, data: Dict[str, Any]):
+        """
+        Sincronizar assinaturas com a resposta do servidor
+        
+        A lista 'symbols' da resposta é a fonte de verdade; símbolos
+        rejeitados ('rejected') são descartados e notificados como erro.
+        
+        Args:
+            data (Dict): Resposta 'subscribed' ou 'unsubscribed'
+        """
+        confirmed = set(data.get('symbols', []))
+        rejected = data.get('rejected', [])
+        
+        with self._tick_lock:
+            dropped = self.subscriptions - confirmed
+            self.subscriptions = confirmed
+        self._reset_tick_state(dropped)
+        
+        if rejected:
+            logger.warning(f"Assinatura rejeitada pelo servidor: {rejected}")
+            self._notify_error_callbacks(f"Assinatura rejeitada: {', '.join(rejected)}")
+    
+    def _tick_dispatcher(self):
+        """
+        Worker thread para entregar ticks conflacionados aos callbacks
+        """
+        while self.running:
+            if not self._tick_event.wait(timeout=1):
+                continue
+            self._tick_event.clear()
+            
+            with self._tick_lock:
+                pending = self._pending_ticks
+                self._pending_ticks = {}
+            
+            for tick in pending.values():
+                self._notify_tick_callbacks(tick)
+    
+    def _reset_tick_state(self, symbols=None):
+        """
+        Descartar sequência, último tick e ticks pendentes dos símbolos informados
+        
+        Args:
+            symbols: Símbolos a reiniciar (None = todos)
+        """
+        with self._tick_lock:
+            if symbols is None:
+                symbols = list(self._latest_ticks)
+            for symbol in symbols:
+                self._tick_seq.pop(symbol, None)
+                self._latest_ticks.pop(symbol, None)
+                self._pending_ticks.pop(symbol, None)
+    
     def _attempt_reconnect(self):
         """
         Tentar reconectar ao servidor
         """
+        # Ticks anteriores à queda da conexão não são mais atuais
+        self._reset_tick_state()
+        
         if not self.auto_reconnect or self.reconnect_attempts >= self.max_reconnect_attempts:
             return
         
@@ -283,6 +415,74 @@ class MT5TCPClient:
         """
         return self.send_command("get_market_data", {"symbol": symbol})
     
+    def subscribe(self, symbols) -> bool:
+        """
+        Assinar streaming de preços (push do servidor)
+        
+        Após a assinatura o servidor envia mensagens 'tick' a cada
+        atualização, entregues aos callbacks de tick. As assinaturas
+        efetivas são confirmadas pela resposta 'subscribed' do servidor.
+        
+        Args:
+            symbols (str | List[str]): Símbolo ou lista de símbolos
+            
+        Returns:
+            bool: True se comando enviado
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = [s for s in dict.fromkeys(symbols) if s]
+        if not symbols:
+            return False
+        
+        self._reset_tick_state(symbols)
+        with self._tick_lock:
+            new_symbols = [s for s in symbols if s not in self.subscriptions]
+            self.subscriptions.update(symbols)
+        
+        if not self.send_command("subscribe", {"symbols": symbols}):
+            with self._tick_lock:
+                self.subscriptions.difference_update(new_symbols)
+            return False
+        return True
+    
+    def unsubscribe(self, symbols=None) -> bool:
+        """
+        Cancelar assinatura de streaming de preços
+        
+        Args:
+            symbols (str | List[str]): Símbolo ou lista de símbolos (None = todos)
+            
+        Returns:
+            bool: True se comando enviado
+        """
+        if symbols is None:
+            symbols = list(self.subscriptions)
+        elif isinstance(symbols, str):
+            symbols = [symbols]
+        if not symbols:
+            return False
+        
+        with self._tick_lock:
+            self.subscriptions.difference_update(symbols)
+        self._reset_tick_state(symbols)
+        
+        return self.send_command("unsubscribe", {"symbols": list(symbols)})
+    
+    def get_latest_tick(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Obter o último tick recebido via streaming
+        
+        Args:
+            symbol (str): Símbolo do ativo
+            
+        Returns:
+            Optional[Dict]: Último tick ou None se ainda não recebido
+        """
+        with self._tick_lock:
+            tick = self._latest_ticks.get(symbol)
+            return dict(tick) if tick else None
+    
     def get_account_info(self) -> bool:
         """
         Solicitar informações da conta
@@ -451,6 +651,18 @@ class MT5TCPClient:
         """
         self.error_callbacks.append(callback)
     
+    def add_tick_callback(self, callback):
+        """
+        Adicionar callback para ticks do streaming
+        
+        Callbacks lentos recebem apenas o tick mais recente de cada
+        símbolo; ticks intermediários são descartados.
+        
+        Args:
+            callback: Função callback(tick)
+        """
+        self.tick_callbacks.append(callback)
+    
     def add_connection_callback(self, callback):
         """
         Adicionar callback para mudanças de conexão
@@ -486,6 +698,19 @@ class MT5TCPClient:
             except Exception as e:
                 logger.error(f"Erro no callback de erro: {e}")
     
+    def _notify_tick_callbacks(self, tick: Dict[str, Any]):
+        """
+        Notificar callbacks de tick
+        
+        Args:
+            tick: Dados do tick
+        """
+        for callback in self.tick_callbacks:
+            try:
+                callback(tick)
+            except Exception as e:
+                logger.error(f"Erro no callback de tick: {e}")
+    
     def _notify_connection_callbacks(self, connected: bool):
         """
         Notificar callbacks de conexão
@@ -521,6 +746,9 @@ def message_handler(data):
         market_data = data.get('data', {})
         logger.info(f"Dados de mercado - Bid: {market_data.get('bid')}, Ask: {market_data.get('ask')}")
     
+    elif action in ('subscribed', 'unsubscribed'):
+        logger.info(f"Streaming {'assinado' if action == 'subscribed' else 'cancelado'}: {data.get('symbols', [])}")
+    
     elif action == 'account_info':
         account_data = data.get('data', {})
         logger.info(f"Conta - Saldo: {account_data.get('balance')}, Equity: {account_data.get('equity')}")
@@ -551,6 +779,16 @@ def message_handler(data):
         logger.info(f"Mensagem recebida: {action} - {data}")
 
 
+def tick_handler(tick):
+    """
+    Handler para ticks do streaming
+    
+    Args:
+        tick: Dados do tick
+    """
+    logger.info(f"Tick {tick.get('symbol')} #{tick.get('seq')} - Bid: {tick.get('bid')}, Ask: {tick.get('ask')}")
+
+
 def connection_handler(connected):
     """
     Handler para mudanças de conexão
@@ -593,6 +831,8 @@ def interactive_menu(client: MT5TCPClient):
         print("8. Lista de símbolos")
         print("9. Dados históricos")
         print("10. Ping")
+        print("11. Assinar streaming de preços")
+        print("12. Cancelar streaming de preços")
         print("0. Sair")
         
         try:
@@ -629,6 +869,12 @@ def interactive_menu(client: MT5TCPClient):
                 client.get_history(symbol, timeframe, start_time, end_time)
             elif choice == '10':
                 client.send_command("ping")
+            elif choice == '11':
+                symbols = input("Símbolos (EURUSD,GBPUSD): ").strip() or "EURUSD,GBPUSD"
+                client.subscribe([s.strip() for s in symbols.split(",")])
+            elif choice == '12':
+                symbols = input("Símbolos (todos): ").strip()
+                client.unsubscribe([s.strip() for s in symbols.split(",")] if symbols else None)
             else:
                 print("Opção inválida!")
                 
@@ -659,6 +905,7 @@ def main():
     client.add_message_callback(message_handler)
     client.add_connection_callback(connection_handler)
     client.add_error_callback(error_handler)
+    client.add_tick_callback(tick_handler)
     
     try:
         # Conectar ao servidor
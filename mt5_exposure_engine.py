@@ -0,0 +1,708 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MT5 Exposure Engine - Versão de Produção
+Copyright 2025, PerplexCoder
+
+Marcação a mercado em tempo real das posições abertas
+Mantém o livro de posições em arrays NumPy e reavalia todas as
+posições a cada tick em uma única passada vetorizada
+"""
+
+import threading
+import logging
+import configparser
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tipos de posição do MT5 (POSITION_TYPE_BUY / POSITION_TYPE_SELL)
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+# Origem da taxa de conversão moeda de cotação -> moeda da conta
+RATE_UNKNOWN = 0    # Sem conversão: valores ficam na moeda de cotação
+RATE_PROFIT = 1     # Derivada do campo 'profit' da resposta 'positions'
+RATE_QUOTE = 2      # Moeda de cotação é a moeda da conta (taxa 1.0)
+RATE_BASE = 3       # Moeda base é a moeda da conta (taxa 1 / preço)
+RATE_EXPLICIT = 4   # Definida por set_symbol_spec
+
+# Origem do tamanho de contrato do símbolo
+CONTRACT_DEFAULT = 0   # default_contract_size (não calibrado)
+CONTRACT_PROFIT = 1    # Calibrado pelo campo 'profit' da resposta 'positions'
+CONTRACT_REPORTED = 2  # Informado pelo servidor ('contract_size') ou set_symbol_spec
+
+
+class ExposureEngine:
+    """
+    Motor de exposição e P&L flutuante do livro de posições
+    
+    As posições são carregadas das respostas 'positions' e atualizadas
+    pelos eventos de trading; os preços chegam pelos ticks do streaming.
+    Valores monetários são convertidos para a moeda da conta quando a
+    taxa do símbolo é conhecida (moeda da conta no par, 'profit' das
+    posições ou set_symbol_spec); símbolos sem taxa aparecem em
+    'unconverted_symbols' e seus valores ficam na moeda de cotação.
+    O tamanho de contrato vem do campo 'contract_size' do servidor, de
+    set_symbol_spec ou é calibrado pelo 'profit' das posições; símbolos
+    ainda no tamanho padrão aparecem em 'uncalibrated_symbols'.
+    
+    Attributes:
+        max_positions (int): Máximo de posições abertas no livro
+        max_volume (float): Volume líquido máximo por símbolo
+        default_contract_size (float): Tamanho de contrato padrão
+        balance (float): Saldo da conta (de 'account_info')
+        leverage (float): Alavancagem da conta (de 'account_info')
+        currency (str): Moeda da conta (de 'account_info')
+    """
+    
+    def __init__(self, max_positions: int = 10, max_volume: float = 100.0,
+                 default_contract_size: float = 100000.0, capacity: int = 1024):
+        """
+        Inicializar motor de exposição
+        
+        Args:
+            max_positions (int): Máximo de posições abertas no livro
+            max_volume (float): Volume líquido máximo por símbolo
+            default_contract_size (float): Tamanho de contrato padrão
+            capacity (int): Capacidade inicial do livro de posições
+        """
+        self.max_positions = max_positions
+        self.max_volume = max_volume
+        self.default_contract_size = default_contract_size
+        self.balance = 0.0
+        self.leverage = 0.0
+        self.currency = ""
+        
+        self._lock = threading.Lock()
+        self._client = None
+        
+        # Livro de posições (uma linha por posição, linhas [0, _count) válidas)
+        self._count = 0
+        self._ticket = np.zeros(capacity, dtype=np.int64)
+        self._symbol_idx = np.zeros(capacity, dtype=np.intp)
+        self._side = np.zeros(capacity, dtype=np.float64)
+        self._volume = np.zeros(capacity, dtype=np.float64)
+        self._price_open = np.zeros(capacity, dtype=np.float64)
+        self._swap = np.zeros(capacity, dtype=np.float64)
+        self._rows: Dict[int, int] = {}
+        
+        # Dados por símbolo (bid e ask são metades de _quotes)
+        self._symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._quotes = np.zeros(0, dtype=np.float64)
+        self._bid = self._quotes[:0]
+        self._ask = self._quotes[0:]
+        self._contract_size = np.zeros(0, dtype=np.float64)
+        self._contract_source = np.zeros(0, dtype=np.int8)
+        self._conversion_rate = np.zeros(0, dtype=np.float64)
+        self._rate_source = np.zeros(0, dtype=np.int8)
+        
+        # Coeficientes por posição (moeda de cotação), recalculados quando o livro muda
+        self._quote_idx = np.zeros(0, dtype=np.intp)
+        self._row_units = np.zeros(0, dtype=np.float64)
+        self._row_cost = np.zeros(0, dtype=np.float64)
+        self._symbol_swap = np.zeros(0, dtype=np.float64)
+        self._exposure_units = np.zeros(0, dtype=np.float64)
+        self._gross_units = np.zeros(0, dtype=np.float64)
+        self._gross_open_value = np.zeros(0, dtype=np.float64)
+        self._net_volume = np.zeros(0, dtype=np.float64)
+        self._gross_volume = np.zeros(0, dtype=np.float64)
+        self._position_count = np.zeros(0, dtype=np.int64)
+        
+        # Resultado da última reavaliação (moeda da conta)
+        self._pnl = np.zeros(0, dtype=np.float64)
+        self._conversion = np.zeros(0, dtype=np.float64)
+        self._symbol_pnl = np.zeros(0, dtype=np.float64)
+        self._exposure = np.zeros(0, dtype=np.float64)
+        self._margin = 0.0
+    
+    @classmethod
+    def from_config(cls, path: str = "config.ini", **kwargs) -> "ExposureEngine":
+        """
+        Criar motor com os limites da seção [TRADING] do config.ini
+        
+        Args:
+            path (str): Caminho do arquivo de configuração
+            **kwargs: Demais argumentos do construtor
+        
+        Returns:
+            ExposureEngine: Motor configurado
+        """
+        config = configparser.ConfigParser()
+        config.read(path, encoding='utf-8')
+        
+        kwargs.setdefault("max_positions", config.getint("TRADING", "max_positions", fallback=10))
+        kwargs.setdefault("max_volume", config.getfloat("TRADING", "max_volume", fallback=100.0))
+        return cls(**kwargs)
+    
+    def attach(self, client):
+        """
+        Conectar o motor a um MT5TCPClient
+        
+        Registra callbacks de mensagem (positions, account_info e
+        eventos de trading), de tick do streaming e de conexão.
+        
+        Args:
+            client: Instância de MT5TCPClient
+        """
+        self._client = client
+        client.add_message_callback(self.on_message)
+        client.add_tick_callback(self.on_tick)
+        client.add_connection_callback(self.on_connection)
+    
+    def on_connection(self, connected: bool):
+        """
+        Ressincronizar conta e livro ao (re)conectar
+        
+        Eventos de trading perdidos durante a desconexão só são
+        refletidos recarregando account_info e positions.
+        
+        Args:
+            connected (bool): Status da conexão
+        """
+        if connected and self._client is not None:
+            self._client.get_account_info()
+            self._client.get_positions()
+    
+    def set_symbol_spec(self, symbol: str, contract_size: Optional[float] = None,
+                        conversion_rate: Optional[float] = None):
+        """
+        Definir especificação do símbolo
+        
+        Args:
+            symbol (str): Símbolo do ativo
+            contract_size (float): Tamanho do contrato (ex: 100000 para forex)
+            conversion_rate (float): Taxa de conversão da moeda de cotação para a moeda da conta
+        """
+        with self._lock:
+            idx = self._get_symbol_index(symbol)
+            if contract_size is not None:
+                self._contract_size[idx] = contract_size
+                self._contract_source[idx] = CONTRACT_REPORTED
+            if conversion_rate is not None:
+                self._conversion_rate[idx] = conversion_rate
+                self._rate_source[idx] = RATE_EXPLICIT
+            self._rebuild()
+    
+    # Entrada de dados
+    def on_message(self, data: Dict[str, Any]):
+        """
+        Processar mensagem recebida do servidor
+        
+        Args:
+            data (Dict): Mensagem JSON decodificada
+        """
+        action = data.get('action')
+        
+        if action == 'positions':
+            self.load_positions(data.get('data', []))
+        elif action == 'account_info':
+            self.update_account(data.get('data', {}))
+        elif action in ('trade_result', 'place_order', 'close_position'):
+            payload = data.get('data', data)
+            if action == 'close_position':
+                payload = dict(payload, operation='close')
+            self.apply_trade_result(payload)
+        elif action == 'market_data':
+            market_data = data.get('data', {})
+            if market_data.get('symbol'):
+                self.update_price(market_data['symbol'], market_data.get('bid', 0), market_data.get('ask', 0))
+    
+    def on_tick(self, tick: Dict[str, Any]):
+        """
+        Processar tick do streaming
+        
+        Args:
+            tick (Dict): Dados do tick (symbol, bid, ask, ...)
+        """
+        self.update_price(tick['symbol'], tick['bid'], tick['ask'])
+    
+    def update_price(self, symbol: str, bid: float, ask: float):
+        """
+        Atualizar preço do símbolo e reavaliar o livro
+        
+        Args:
+            symbol (str): Símbolo do ativo
+            bid (float): Preço de venda
+            ask (float): Preço de compra
+        """
+        with self._lock:
+            n_symbols = len(self._symbols)
+            idx = self._get_symbol_index(symbol)
+            self._bid[idx] = bid
+            self._ask[idx] = ask
+            
+            # Símbolo novo altera o layout dos arrays por símbolo
+            if idx < n_symbols:
+                self._revalue()
+            else:
+                self._rebuild()
+    
+    def update_account(self, account: Dict[str, Any]):
+        """
+        Atualizar dados da conta (resposta 'account_info')
+        
+        Args:
+            account (Dict): Dados da conta
+        """
+        with self._lock:
+            self.balance = float(account.get('balance', self.balance))
+            self.leverage = float(account.get('leverage', self.leverage))
+            
+            currency = account.get('currency', self.currency)
+            if currency != self.currency:
+                self.currency = currency
+                for idx in range(len(self._symbols)):
+                    self._apply_currency_rate(idx)
+            
+            self._rebuild()
+    
+    def load_positions(self, positions: List[Dict[str, Any]]):
+        """
+        Substituir o livro pelas posições da resposta 'positions'
+        
+        Args:
+            positions (List[Dict]): Posições abertas
+        """
+        with self._lock:
+            self._count = 0
+            self._rows.clear()
+            
+            # Maior deslocamento (preço x volume) e profit correspondente por símbolo
+            profit_samples: Dict[int, tuple] = {}
+            
+            for position in positions:
+                self._add_position(position)
+                
+                idx = self._symbol_index[position['symbol']]
+                is_buy = int(position.get('type', POSITION_TYPE_BUY)) != POSITION_TYPE_SELL
+                price_current = float(position.get('price_current', 0))
+                if price_current <= 0:
+                    continue
+                
+                # price_current é o bid das compras e o ask das vendas:
+                # semear apenas esse lado enquanto não houver tick
+                quotes = self._bid if is_buy else self._ask
+                if quotes[idx] == 0:
+                    quotes[idx] = price_current
+                
+                if 'profit' in position:
+                    side = 1.0 if is_buy else -1.0
+                    move = ((price_current - float(position.get('price_open', 0))) * side *
+                            float(position.get('volume', 0)))
+                    if abs(move) > abs(profit_samples.get(idx, (0.0,))[0]):
+                        profit_samples[idx] = (move, price_current, float(position['profit']))
+            
+            # profit = deslocamento * contrato * taxa: com a taxa conhecida o profit
+            # calibra o contrato; com o contrato conhecido, calibra a taxa
+            for idx, (move, price_current, profit) in profit_samples.items():
+                if abs(profit) < 1.0:
+                    continue
+                rate_source = self._rate_source[idx]
+                if (self._contract_source[idx] != CONTRACT_REPORTED and
+                        rate_source in (RATE_QUOTE, RATE_BASE, RATE_EXPLICIT)):
+                    rate = 1.0 / price_current if rate_source == RATE_BASE else self._conversion_rate[idx]
+                    # profit vem arredondado em 2 casas: 3 algarismos significativos bastam
+                    self._contract_size[idx] = float(f"{profit / (move * rate):.3g}")
+                    self._contract_source[idx] = CONTRACT_PROFIT
+                elif rate_source in (RATE_UNKNOWN, RATE_PROFIT):
+                    self._conversion_rate[idx] = profit / (move * self._contract_size[idx])
+                    self._rate_source[idx] = RATE_PROFIT
+            
+            self._rebuild()
+    
+    def apply_trade_result(self, result: Dict[str, Any]):
+        """
+        Aplicar evento de trading ao livro
+        
+        Aberturas adicionam a posição; fechamentos ('operation': 'close')
+        removem a posição ou reduzem o volume no fechamento parcial.
+        Fechamentos sem volume informado não são adivinhados: o livro é
+        recarregado com get_positions no cliente conectado.
+        
+        Args:
+            result (Dict): Dados do resultado (ticket, symbol, type, volume, price, contract_size)
+        """
+        if not result.get('success', True) or not result.get('ticket'):
+            return
+        
+        ticket = int(result['ticket'])
+        
+        if result.get('operation') == 'close' and 'volume' not in result:
+            if self._client is not None:
+                self._client.get_positions()
+            else:
+                logger.warning(f"Fechamento do ticket {ticket} sem volume informado; livro não alterado")
+            return
+        
+        with self._lock:
+            if result.get('operation') == 'close':
+                row = self._rows.get(ticket)
+                if row is None:
+                    return
+                # Arredondar o restante evita linhas fantasmas por erro de ponto flutuante
+                volume = float(result.get('volume', 0))
+                remaining = round(self._volume[row] - volume, 8) if volume > 0 else 0.0
+                if remaining > 0:
+                    self._volume[row] = remaining
+                else:
+                    self._remove_position(ticket)
+            elif ticket in self._rows:
+                return
+            elif result.get('type') in (POSITION_TYPE_BUY, POSITION_TYPE_SELL) and result.get('symbol'):
+                self._add_position({
+                    "ticket": ticket,
+                    "symbol": result['symbol'],
+                    "type": result['type'],
+                    "volume": result.get('volume', 0),
+                    "price_open": result.get('price', 0),
+                    "contract_size": result.get('contract_size', 0),
+                })
+            else:
+                # Ordem pendente, não altera o livro de posições
+                return
+            
+            self._rebuild()
+    
+    # Resultados
+    @property
+    def positions_total(self) -> int:
+        """
+        Número de posições abertas no livro
+        """
+        with self._lock:
+            return self._count
+    
+    @property
+    def floating_pnl(self) -> float:
+        """
+        P&L flutuante total (inclui swap) na moeda da conta
+        """
+        with self._lock:
+            return float(self._symbol_pnl.sum())
+    
+    @property
+    def equity(self) -> float:
+        """
+        Equity estimado (saldo + P&L flutuante)
+        """
+        with self._lock:
+            return self.balance + float(self._symbol_pnl.sum())
+    
+    @property
+    def margin(self) -> float:
+        """
+        Margem estimada (nocional na moeda base convertido / alavancagem)
+        """
+        with self._lock:
+            return self._margin
+    
+    def get_position_pnl(self, ticket: int) -> Optional[float]:
+        """
+        Obter P&L flutuante de uma posição
+        
+        Args:
+            ticket (int): Ticket da posição
+        
+        Returns:
+            Optional[float]: P&L na moeda da conta ou None se não encontrada
+        """
+        with self._lock:
+            row = self._rows.get(ticket)
+            if row is None:
+                return None
+            return float(self._pnl[row] * self._conversion[self._symbol_idx[row]] + self._swap[row])
+    
+    def get_exposure(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obter exposição por símbolo
+        
+        Returns:
+            Dict: Por símbolo, positions, net_volume, gross_volume,
+                  exposure (nocional líquido), floating_pnl, converted
+                  (False = valores na moeda de cotação) e calibrated
+                  (False = tamanho de contrato padrão)
+        """
+        with self._lock:
+            return {
+                symbol: {
+                    "positions": int(self._position_count[i]),
+                    "net_volume": float(self._net_volume[i]),
+                    "gross_volume": float(self._gross_volume[i]),
+                    "exposure": float(self._exposure[i]),
+                    "floating_pnl": float(self._symbol_pnl[i]),
+                    "converted": bool(self._rate_source[i] != RATE_UNKNOWN),
+                    "calibrated": bool(self._contract_source[i] != CONTRACT_DEFAULT),
+                }
+                for i, symbol in enumerate(self._symbols)
+                if self._position_count[i] > 0
+            }
+    
+    def get_breaches(self) -> List[Dict[str, Any]]:
+        """
+        Verificar violações de limites (max_positions e max_volume)
+        
+        Returns:
+            List[Dict]: Violações encontradas (limit, symbol, value, max)
+        """
+        with self._lock:
+            return self._get_breaches()
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Obter resumo do livro (um único estado consistente)
+        
+        Returns:
+            Dict: positions, floating_pnl, balance, equity, margin, margin_level,
+                  breaches, unconverted_symbols e uncalibrated_symbols
+        """
+        with self._lock:
+            floating_pnl = float(self._symbol_pnl.sum())
+            equity = self.balance + floating_pnl
+            margin = self._margin
+            open_symbols = self._position_count > 0
+            n_symbols = len(self._symbols)
+            
+            return {
+                "positions": self._count,
+                "floating_pnl": floating_pnl,
+                "balance": self.balance,
+                "equity": equity,
+                "margin": margin,
+                "margin_level": equity / margin * 100 if margin > 0 else 0.0,
+                "breaches": self._get_breaches(),
+                "unconverted_symbols": [
+                    self._symbols[i]
+                    for i in np.flatnonzero(open_symbols & (self._rate_source[:n_symbols] == RATE_UNKNOWN))
+                ],
+                "uncalibrated_symbols": [
+                    self._symbols[i]
+                    for i in np.flatnonzero(open_symbols & (self._contract_source[:n_symbols] == CONTRACT_DEFAULT))
+                ],
+            }
+    
+    # Internos (chamar com _lock adquirido)
+    def _get_breaches(self) -> List[Dict[str, Any]]:
+        """
+        Listar violações de limites do estado atual
+        
+        Returns:
+            List[Dict]: Violações encontradas (limit, symbol, value, max)
+        """
+        breaches = []
+        
+        if self._count > self.max_positions:
+            breaches.append({
+                "limit": "max_positions",
+                "symbol": None,
+                "value": self._count,
+                "max": self.max_positions,
+            })
+        
+        for i in np.flatnonzero(np.abs(self._net_volume) > self.max_volume):
+            breaches.append({
+                "limit": "max_volume",
+                "symbol": self._symbols[i],
+                "value": float(self._net_volume[i]),
+                "max": self.max_volume,
+            })
+        
+        return breaches
+    
+    def _apply_currency_rate(self, idx: int):
+        """
+        Definir taxa de conversão pela moeda da conta presente no par
+        
+        Args:
+            idx (int): Índice do símbolo
+        """
+        if self._rate_source[idx] == RATE_EXPLICIT:
+            return
+        
+        name = self._symbols[idx][:6].upper()
+        base, quote = (name[:3], name[3:]) if len(name) == 6 and name.isalpha() else ("", "")
+        
+        if self.currency and quote == self.currency:
+            self._conversion_rate[idx] = 1.0
+            self._rate_source[idx] = RATE_QUOTE
+        elif self.currency and base == self.currency:
+            self._conversion_rate[idx] = 1.0
+            self._rate_source[idx] = RATE_BASE
+        elif self._rate_source[idx] in (RATE_QUOTE, RATE_BASE):
+            # Moeda da conta mudou e o par não a contém mais
+            self._conversion_rate[idx] = 1.0
+            self._rate_source[idx] = RATE_UNKNOWN
+    
+    def _get_symbol_index(self, symbol: str) -> int:
+        """
+        Obter índice do símbolo, registrando-o se necessário
+        
+        Args:
+            symbol (str): Símbolo do ativo
+        
+        Returns:
+            int: Índice do símbolo nos arrays por símbolo
+        """
+        idx = self._symbol_index.get(symbol)
+        if idx is not None:
+            return idx
+        
+        idx = len(self._symbols)
+        self._symbols.append(symbol)
+        self._symbol_index[symbol] = idx
+        
+        if idx >= len(self._bid):
+            size = max(16, 2 * len(self._bid))
+            quotes = np.zeros(2 * size, dtype=np.float64)
+            quotes[:idx] = self._bid[:idx]
+            quotes[size:size + idx] = self._ask[:idx]
+            self._quotes = quotes
+            self._bid = quotes[:size]
+            self._ask = quotes[size:]
+            self._contract_size = self._grow(self._contract_size, size)
+            self._contract_source = self._grow(self._contract_source, size)
+            self._conversion_rate = self._grow(self._conversion_rate, size)
+            self._rate_source = self._grow(self._rate_source, size)
+        
+        self._contract_size[idx] = self.default_contract_size
+        self._contract_source[idx] = CONTRACT_DEFAULT
+        self._conversion_rate[idx] = 1.0
+        self._rate_source[idx] = RATE_UNKNOWN
+        self._apply_currency_rate(idx)
+        return idx
+    
+    def _add_position(self, position: Dict[str, Any]):
+        """
+        Adicionar posição ao livro
+        
+        Args:
+            position (Dict): Posição no formato da resposta 'positions'
+        """
+        ticket = int(position['ticket'])
+        row = self._rows.get(ticket)
+        
+        if row is None:
+            row = self._count
+            if row >= len(self._ticket):
+                size = 2 * len(self._ticket)
+                self._ticket = self._grow(self._ticket, size)
+                self._symbol_idx = self._grow(self._symbol_idx, size)
+                self._side = self._grow(self._side, size)
+                self._volume = self._grow(self._volume, size)
+                self._price_open = self._grow(self._price_open, size)
+                self._swap = self._grow(self._swap, size)
+            self._rows[ticket] = row
+            self._count += 1
+        
+        idx = self._get_symbol_index(position['symbol'])
+        contract_size = float(position.get('contract_size') or 0)
+        if contract_size > 0:
+            self._contract_size[idx] = contract_size
+            self._contract_source[idx] = CONTRACT_REPORTED
+        
+        self._ticket[row] = ticket
+        self._symbol_idx[row] = idx
+        self._side[row] = -1.0 if int(position.get('type', POSITION_TYPE_BUY)) == POSITION_TYPE_SELL else 1.0
+        self._volume[row] = float(position.get('volume', 0))
+        self._price_open[row] = float(position.get('price_open', 0))
+        self._swap[row] = float(position.get('swap', 0))
+    
+    def _remove_position(self, ticket: int):
+        """
+        Remover posição do livro (move a última linha para a vaga)
+        
+        Args:
+            ticket (int): Ticket da posição
+        """
+        row = self._rows.pop(ticket)
+        last = self._count - 1
+        
+        if row != last:
+            for array in (self._ticket, self._symbol_idx, self._side,
+                          self._volume, self._price_open, self._swap):
+                array[row] = array[last]
+            self._rows[int(self._ticket[row])] = row
+        
+        self._count = last
+    
+    def _rebuild(self):
+        """
+        Recalcular coeficientes que independem do preço e reavaliar o livro
+        """
+        n = self._count
+        n_symbols = len(self._symbols)
+        
+        sym = self._symbol_idx[:n]
+        side = self._side[:n]
+        volume = self._volume[:n]
+        
+        # Unidades com sinal (moeda de cotação): P&L = preço de fechamento * units - cost
+        signed_volume = side * volume
+        contract_size = self._contract_size[sym]
+        self._row_units = signed_volume * contract_size
+        self._row_cost = self._row_units * self._price_open[:n]
+        
+        # Compra fecha no bid, venda fecha no ask
+        self._quote_idx = np.where(side > 0, sym, sym + len(self._bid))
+        
+        gross_units = volume * contract_size
+        self._net_volume = np.bincount(sym, weights=signed_volume, minlength=n_symbols)
+        self._gross_volume = np.bincount(sym, weights=volume, minlength=n_symbols)
+        self._position_count = np.bincount(sym, minlength=n_symbols)
+        self._symbol_swap = np.bincount(sym, weights=self._swap[:n], minlength=n_symbols)
+        self._exposure_units = np.bincount(sym, weights=self._row_units, minlength=n_symbols)
+        self._gross_units = np.bincount(sym, weights=gross_units, minlength=n_symbols)
+        self._gross_open_value = np.bincount(sym, weights=gross_units * self._price_open[:n], minlength=n_symbols)
+        
+        self._revalue()
+    
+    def _revalue(self):
+        """
+        Reavaliar todo o livro contra os últimos bid/ask
+        """
+        n_symbols = len(self._symbols)
+        
+        # P&L por posição na moeda de cotação; lado ainda sem cotação não gera P&L
+        close_price = self._quotes[self._quote_idx]
+        self._pnl = np.where(close_price > 0, close_price * self._row_units - self._row_cost, 0.0)
+        symbol_pnl = np.bincount(self._symbol_idx[:self._count], weights=self._pnl, minlength=n_symbols)
+        
+        bid = self._bid[:n_symbols]
+        ask = self._ask[:n_symbols]
+        mid = np.where((bid > 0) & (ask > 0), (bid + ask) * 0.5, np.maximum(bid, ask))
+        
+        # Conversão cotação -> conta; pares com a moeda da conta na base usam 1 / preço
+        is_base = self._rate_source[:n_symbols] == RATE_BASE
+        inverse_mid = np.divide(1.0, mid, out=np.zeros(n_symbols), where=mid > 0)
+        self._conversion = np.where(is_base, inverse_mid, self._conversion_rate[:n_symbols])
+        
+        self._symbol_pnl = symbol_pnl * self._conversion + self._symbol_swap
+        self._exposure = self._exposure_units * mid * self._conversion
+        
+        # Margem: nocional na moeda base (volume * contrato) convertido para a conta
+        if self.leverage > 0:
+            average_open = np.divide(self._gross_open_value, self._gross_units,
+                                     out=np.zeros(n_symbols), where=self._gross_units > 0)
+            base_rate = np.where(is_base, 1.0, np.where(mid > 0, mid, average_open) * self._conversion)
+            self._margin = float(np.dot(self._gross_units, base_rate)) / self.leverage
+        else:
+            self._margin = 0.0
+    
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        """
+        Redimensionar array preservando o conteúdo
+        
+        Args:
+            array (np.ndarray): Array original
+            size (int): Novo tamanho
+        
+        Returns:
+            np.ndarray: Array redimensionado
+        """
+        grown = np.zeros(size, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
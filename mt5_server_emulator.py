@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MT5 Server Emulator - Versão de Produção
+Copyright 2025, PerplexCoder
+
+Servidor TCP local que emula o MT5_Server_TCP.mq5 para desenvolvimento
+e testes do cliente sem um terminal MetaTrader 5 em execução.
+Suporta o modo de streaming (subscribe/unsubscribe) com push de ticks
+e uma conta simulada com posições e eventos trade_result
+"""
+
+import socket
+import json
+import time
+import random
+import threading
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+import sys
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Preços iniciais dos símbolos emulados
+DEFAULT_PRICES = {
+    "EURUSD": 1.08500,
+    "GBPUSD": 1.27000,
+    "USDJPY": 149.500,
+    "AUDUSD": 0.65500,
+    "USDCAD": 1.36000,
+    "USDCHF": 0.88000,
+    "NZDUSD": 0.61000,
+    "XAUUSD": 2000.00,
+}
+
+# Tamanho de contrato por símbolo (padrão: 100000 para pares de moedas)
+DEFAULT_CONTRACT_SIZE = 100000.0
+CONTRACT_SIZES = {
+    "XAUUSD": 100.0,
+}
+
+
+class EmulatedClient:
+    """
+    Cliente conectado ao emulador
+    
+    Attributes:
+        index (int): Slot do cliente
+        socket (socket.socket): Socket do cliente
+        subscriptions (set): Símbolos assinados para streaming
+    """
+    
+    def __init__(self, index: int, client_socket: socket.socket):
+        """
+        Inicializar cliente emulado
+        
+        Args:
+            index (int): Slot do cliente
+            client_socket (socket.socket): Socket aceito
+        """
+        self.index = index
+        self.socket = client_socket
+        self.subscriptions = set()
+        self.send_lock = threading.Lock()
+        self.is_active = True
+
+
+class MT5ServerEmulator:
+    """
+    Emulador do servidor TCP do MT5
+    
+    Attributes:
+        host (str): Endereço IP de escuta
+        port (int): Porta de escuta
+        update_interval (float): Intervalo de atualização dos ticks em segundos
+        symbols (Dict[str, float]): Preço médio atual de cada símbolo
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 9090, update_interval: float = 0.1,
+                 symbols: Optional[List[str]] = None, magic_number: int = 123456):
+        """
+        Inicializar emulador
+        
+        Args:
+            host (str): Endereço IP de escuta
+            port (int): Porta de escuta
+            update_interval (float): Intervalo de atualização dos ticks em segundos
+            symbols (List[str]): Símbolos emulados (padrão: DEFAULT_PRICES)
+            magic_number (int): Número mágico informado aos clientes
+        """
+        self.host = host
+        self.port = port
+        self.update_interval = update_interval
+        self.magic_number = magic_number
+        self.symbols = {s: DEFAULT_PRICES.get(s, 1.0) for s in (symbols or DEFAULT_PRICES)}
+        
+        self.server_socket = None
+        self.running = False
+        self.clients: Dict[int, EmulatedClient] = {}
+        self.clients_lock = threading.Lock()
+        self.next_client_index = 0
+        
+        # Sequência por símbolo do streaming
+        self.tick_seq: Dict[str, int] = {s: 0 for s in self.symbols}
+        
+        # Conta simulada
+        self.balance = 10000.0
+        self.leverage = 100
+        self.contract_sizes = {s: CONTRACT_SIZES.get(s, DEFAULT_CONTRACT_SIZE) for s in self.symbols}
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.positions_lock = threading.Lock()
+        self.next_ticket = 1000
+        
+        self.accept_thread = None
+        self.push_thread = None
+    
+    def start(self) -> bool:
+        """
+        Iniciar servidor emulado
+        
+        Returns:
+            bool: True se iniciado com sucesso
+        """
+        try:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen()
+            self.server_socket.settimeout(1)
+            self.port = self.server_socket.getsockname()[1]
+        except Exception as e:
+            logger.error(f"Erro ao iniciar emulador: {e}")
+            return False
+        
+        self.running = True
+        
+        self.accept_thread = threading.Thread(target=self._accept_worker, daemon=True)
+        self.accept_thread.start()
+        
+        self.push_thread = threading.Thread(target=self._push_worker, daemon=True)
+        self.push_thread.start()
+        
+        logger.info(f"Emulador MT5 iniciado em {self.host}:{self.port}")
+        return True
+    
+    def stop(self):
+        """
+        Parar servidor emulado e desconectar clientes
+        """
+        self.running = False
+        
+        with self.clients_lock:
+            clients = list(self.clients.values())
+        for client in clients:
+            self._disconnect_client(client)
+        
+        if self.server_socket:
+            try:
+                self.server_socket.close()
+            except:
+                pass
+            self.server_socket = None
+        
+        for thread in (self.accept_thread, self.push_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=2)
+        
+        logger.info("Emulador MT5 finalizado")
+    
+    def _accept_worker(self):
+        """
+        Worker thread para aceitar novas conexões
+        """
+        while self.running:
+            try:
+                client_socket, address = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            except Exception:
+                break
+            
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            with self.clients_lock:
+                client = EmulatedClient(self.next_client_index, client_socket)
+                self.clients[client.index] = client
+                self.next_client_index += 1
+            
+            logger.info(f"Novo cliente conectado no slot {client.index} ({address[0]}:{address[1]})")
+            
+            self._send(client, self._create_welcome_message())
+            threading.Thread(target=self._client_worker, args=(client,), daemon=True).start()
+    
+    def _client_worker(self, client: EmulatedClient):
+        """
+        Worker thread para receber comandos de um cliente
+        
+        Args:
+            client (EmulatedClient): Cliente conectado
+        """
+        buffer = ""
+        
+        while self.running and client.is_active:
+            try:
+                data = client.socket.recv(4096).decode('utf-8')
+            except Exception:
+                break
+            
+            if not data:
+                break
+            
+            buffer += data
+            while '\n' in buffer:
+                line, buffer = buffer.split('\n', 1)
+                if line.strip():
+                    response = self.process_command(line.strip(), client)
+                    if response:
+                        self._send(client, response)
+        
+        self._disconnect_client(client)
+    
+    def _push_worker(self):
+        """
+        Worker thread que atualiza os preços e envia ticks aos assinantes
+        """
+        while self.running:
+            time.sleep(self.update_interval)
+            
+            with self.clients_lock:
+                clients = list(self.clients.values())
+            
+            subscribed = set()
+            for client in clients:
+                subscribed.update(client.subscriptions)
+            
+            for symbol in subscribed:
+                tick = self._next_tick(symbol)
+                message = {"action": "tick", "data": tick}
+                for client in clients:
+                    if symbol in client.subscriptions:
+                        self._send(client, message)
+    
+    def _next_tick(self, symbol: str) -> Dict[str, Any]:
+        """
+        Gerar próximo tick do símbolo (passeio aleatório)
+        
+        Args:
+            symbol (str): Símbolo do ativo
+        
+        Returns:
+            Dict: Dados do tick com número de sequência
+        """
+        mid = self.symbols[symbol]
+        mid *= 1 + random.gauss(0, 0.00005)
+        self.symbols[symbol] = mid
+        
+        self.tick_seq[symbol] += 1
+        return self._market_snapshot(symbol, seq=self.tick_seq[symbol])
+    
+    def _market_snapshot(self, symbol: str, seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Montar dados de mercado atuais do símbolo
+        
+        Args:
+            symbol (str): Símbolo do ativo
+            seq (int): Número de sequência do streaming (opcional)
+        
+        Returns:
+            Dict: Dados de mercado no formato do servidor MT5
+        """
+        mid = self.symbols[symbol]
+        digits = 3 if mid > 20 else 5
+        point = 10 ** -digits
+        spread_points = 10
+        bid = round(mid - spread_points * point / 2, digits)
+        ask = round(bid + spread_points * point, digits)
+        now = time.time()
+        
+        data = {
+            "symbol": symbol,
+            "bid": bid,
+            "ask": ask,
+            "spread": float(spread_points),
+            "last": bid,
+            "volume": 0,
+            "time": datetime.fromtimestamp(now).strftime("%Y.%m.%d %H:%M:%S"),
+            "time_msc": int(now * 1000),
+            "digits": digits,
+        }
+        if seq is not None:
+            data["seq"] = seq
+        return data
+    
+    def process_command(self, message: str, client: EmulatedClient) -> Optional[Dict[str, Any]]:
+        """
+        Processar comando recebido do cliente
+        
+        Args:
+            message (str): Comando JSON recebido
+            client (EmulatedClient): Cliente que enviou o comando
+        
+        Returns:
+            Optional[Dict]: Resposta a enviar (None = sem resposta)
+        """
+        try:
+            command = json.loads(message)
+        except json.JSONDecodeError:
+            return self._create_error_response("JSON inválido", message)
+        
+        action = command.get("action", "")
+        
+        if action == "ping":
+            return {"action": "pong", "server_time": int(time.time()), "status": "ok"}
+        elif action == "get_market_data":
+            symbol = command.get("symbol", "EURUSD")
+            if symbol not in self.symbols:
+                return self._create_error_response(f"Símbolo não disponível: {symbol}", message)
+            return {"action": "market_data", "data": self._market_snapshot(symbol)}
+        elif action == "subscribe":
+            return self._process_subscription(command, client, subscribe=True)
+        elif action == "unsubscribe":
+            return self._process_subscription(command, client, subscribe=False)
+        elif action == "get_positions":
+            return {"action": "positions", "data": self._positions_snapshot()}
+        elif action == "get_account_info":
+            return {"action": "account_info", "data": self._account_snapshot()}
+        elif action == "place_order":
+            return self._process_place_order(command)
+        elif action == "close_position":
+            return self._process_close_position(command)
+        elif action == "get_server_status":
+            with self.clients_lock:
+                active_clients = len(self.clients)
+            return {
+                "action": "server_status",
+                "data": {
+                    "server_running": self.running,
+                    "active_clients": active_clients,
+                    "server_time": int(time.time()),
+                    "magic_number": self.magic_number,
+                    "emulator": True,
+                }
+            }
+        
+        return self._create_error_response("Comando não reconhecido", message)
+    
+    def _process_subscription(self, command: Dict[str, Any], client: EmulatedClient,
+                              subscribe: bool) -> Dict[str, Any]:
+        """
+        Processar comandos subscribe/unsubscribe
+        
+        Args:
+            command (Dict): Comando recebido
+            client (EmulatedClient): Cliente que enviou o comando
+            subscribe (bool): True para assinar, False para cancelar
+        
+        Returns:
+            Dict: Resposta com os símbolos assinados e os rejeitados
+        """
+        symbols = command.get("symbols", [])
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        
+        # Cada símbolo é aceito ou rejeitado individualmente
+        rejected = []
+        if subscribe:
+            rejected = [s for s in symbols if s not in self.symbols]
+            client.subscriptions.update(s for s in symbols if s in self.symbols)
+        elif symbols:
+            client.subscriptions.difference_update(symbols)
+        else:
+            client.subscriptions.clear()
+        
+        return {
+            "action": "subscribed" if subscribe else "unsubscribed",
+            "symbols": sorted(client.subscriptions),
+            "rejected": rejected,
+            "status": "partial" if rejected else "ok"
+        }
+    
+    def _position_profit(self, position: Dict[str, Any]) -> float:
+        """
+        Calcular lucro flutuante da posição no preço atual
+        
+        Args:
+            position (Dict): Posição emulada
+        
+        Returns:
+            float: Lucro na moeda da conta (USD)
+        """
+        snapshot = self._market_snapshot(position["symbol"])
+        if position["type"] == 0:
+            profit = (snapshot["bid"] - position["price_open"]) * position["volume"] * position["contract_size"]
+        else:
+            profit = (position["price_open"] - snapshot["ask"]) * position["volume"] * position["contract_size"]
+        return profit * self._quote_to_account_rate(position["symbol"])
+    
+    def _quote_to_account_rate(self, symbol: str) -> float:
+        """
+        Taxa de conversão da moeda de cotação para a moeda da conta (USD)
+        
+        Args:
+            symbol (str): Símbolo do ativo (todos os emulados contêm USD)
+        
+        Returns:
+            float: Taxa de conversão
+        """
+        if symbol.startswith("USD"):
+            return 1.0 / self.symbols[symbol]
+        return 1.0
+    
+    def _positions_snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Montar lista de posições no formato do servidor MT5
+        
+        Returns:
+            List[Dict]: Posições abertas
+        """
+        with self.positions_lock:
+            positions = [dict(p) for p in self.positions.values()]
+        
+        for position in positions:
+            snapshot = self._market_snapshot(position["symbol"])
+            position["price_current"] = snapshot["bid"] if position["type"] == 0 else snapshot["ask"]
+            position["profit"] = round(self._position_profit(position), 2)
+        return positions
+    
+    def _account_snapshot(self) -> Dict[str, Any]:
+        """
+        Montar informações da conta simulada
+        
+        Returns:
+            Dict: Dados da conta no formato do servidor MT5
+        """
+        positions = self._positions_snapshot()
+        profit = sum(p["profit"] for p in positions)
+        # Nocional na moeda base convertido para a conta
+        margin = sum(p["volume"] * p["contract_size"] * self.symbols[p["symbol"]] *
+                     self._quote_to_account_rate(p["symbol"]) for p in positions) / self.leverage
+        equity = self.balance + profit
+        
+        return {
+            "login": 0,
+            "name": "Emulador",
+            "server": "MT5 Emulator",
+            "currency": "USD",
+            "balance": round(self.balance, 2),
+            "equity": round(equity, 2),
+            "profit": round(profit, 2),
+            "margin": round(margin, 2),
+            "margin_free": round(equity - margin, 2),
+            "margin_level": round(equity / margin * 100, 2) if margin > 0 else 0.0,
+            "leverage": self.leverage,
+        }
+    
+    def _process_place_order(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executar ordem a mercado na conta simulada
+        
+        Args:
+            command (Dict): Comando place_order
+        
+        Returns:
+            Dict: Evento trade_result
+        """
+        symbol = command.get("symbol", "EURUSD")
+        order_type = str(command.get("type", "buy")).lower()
+        volume = float(command.get("volume", 0.01))
+        
+        if symbol not in self.symbols:
+            return self._create_trade_result(False, f"Símbolo não disponível: {symbol}")
+        if order_type not in ("buy", "sell"):
+            return self._create_trade_result(False, f"Tipo de ordem não suportado no emulador: {order_type}")
+        
+        snapshot = self._market_snapshot(symbol)
+        position_type = 0 if order_type == "buy" else 1
+        
+        with self.positions_lock:
+            self.next_ticket += 1
+            position = {
+                "ticket": self.next_ticket,
+                "symbol": symbol,
+                "type": position_type,
+                "volume": volume,
+                "contract_size": self.contract_sizes[symbol],
+                "price_open": snapshot["ask"] if position_type == 0 else snapshot["bid"],
+                "swap": 0.0,
+                "sl": float(command.get("sl", 0)),
+                "tp": float(command.get("tp", 0)),
+                "time": snapshot["time"],
+                "magic": self.magic_number,
+                "comment": command.get("comment", ""),
+            }
+            self.positions[position["ticket"]] = position
+        
+        return self._create_trade_result(True, "Ordem executada", operation="open", ticket=position["ticket"],
+                                         symbol=symbol, type=position_type, volume=volume,
+                                         contract_size=position["contract_size"], price=position["price_open"])
+    
+    def _process_close_position(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fechar posição (total ou parcial) na conta simulada
+        
+        Args:
+            command (Dict): Comando close_position
+        
+        Returns:
+            Dict: Evento trade_result
+        """
+        ticket = int(command.get("ticket", 0))
+        volume = float(command.get("volume", 0))
+        
+        with self.positions_lock:
+            position = self.positions.get(ticket)
+            if position is None:
+                return self._create_trade_result(False, "Posição não encontrada", ticket=ticket)
+            
+            if volume <= 0 or volume >= position["volume"]:
+                volume = position["volume"]
+            
+            closed = dict(position, volume=volume)
+            self.balance += self._position_profit(closed)
+            
+            position["volume"] = round(position["volume"] - volume, 8)
+            if position["volume"] <= 0:
+                del self.positions[ticket]
+        
+        snapshot = self._market_snapshot(closed["symbol"])
+        price = snapshot["bid"] if closed["type"] == 0 else snapshot["ask"]
+        return self._create_trade_result(True, "Posição fechada", operation="close", ticket=ticket,
+                                         symbol=closed["symbol"], type=closed["type"], volume=volume,
+                                         contract_size=closed["contract_size"], price=price)
+    
+    def _create_trade_result(self, success: bool, message: str, **fields) -> Dict[str, Any]:
+        """
+        Criar evento trade_result
+        
+        Args:
+            success (bool): Status da operação
+            message (str): Mensagem descritiva
+            **fields: Dados adicionais (operation, ticket, symbol, type, volume, price)
+        
+        Returns:
+            Dict: Evento trade_result
+        """
+        data = {"success": success, "message": message}
+        data.update(fields)
+        return {"action": "trade_result", "data": data}
+    
+    def _create_welcome_message(self) -> Dict[str, Any]:
+        """
+        Criar mensagem de boas-vindas
+        
+        Returns:
+            Dict: Mensagem de boas-vindas
+        """
+        return {
+            "action": "welcome",
+            "server": "MT5 TCP Server Emulator v2.00",
+            "symbol": next(iter(self.symbols)),
+            "server_time": int(time.time()),
+            "magic_number": self.magic_number,
+            "status": "connected"
+        }
+    
+    def _create_error_response(self, error_message: str, received_command: str = "") -> Dict[str, Any]:
+        """
+        Criar resposta de erro
+        
+        Args:
+            error_message (str): Mensagem de erro
+            received_command (str): Comando recebido
+        
+        Returns:
+            Dict: Resposta de erro
+        """
+        response = {"action": "error", "error": error_message}
+        if received_command:
+            response["received"] = received_command
+        response["timestamp"] = datetime.now().strftime("%Y.%m.%d %H:%M")
+        return response
+    
+    def _send(self, client: EmulatedClient, message: Dict[str, Any]) -> bool:
+        """
+        Enviar mensagem JSON para o cliente
+        
+        Args:
+            client (EmulatedClient): Cliente destino
+            message (Dict): Mensagem a enviar
+        
+        Returns:
+            bool: True se enviado com sucesso
+        """
+        if not client.is_active:
+            return False
+        
+        try:
+            with client.send_lock:
+                client.socket.sendall((json.dumps(message) + "\n").encode('utf-8'))
+            return True
+        except Exception as e:
+            logger.error(f"Falha ao enviar dados para cliente {client.index}: {e}")
+            self._disconnect_client(client)
+            return False
+    
+    def _disconnect_client(self, client: EmulatedClient):
+        """
+        Desconectar cliente
+        
+        Args:
+            client (EmulatedClient): Cliente a desconectar
+        """
+        with self.clients_lock:
+            if self.clients.pop(client.index, None) is None:
+                return
+            active_clients = len(self.clients)
+        
+        client.is_active = False
+        client.subscriptions.clear()
+        try:
+            # shutdown() encerra a conexão mesmo com recv() pendente em outra thread
+            client.socket.shutdown(socket.SHUT_RDWR)
+        except:
+            pass
+        try:
+            client.socket.close()
+        except:
+            pass
+        
+        logger.info(f"Cliente {client.index} desconectado. Clientes ativos: {active_clients}")
+
+
+def main():
+    """
+    Função principal do emulador
+    """
+    parser = argparse.ArgumentParser(description="Emulador local do MT5 TCP Server")
+    parser.add_argument("--host", default="127.0.0.1", help="IP de escuta (127.0.0.1)")
+    parser.add_argument("--port", type=int, default=9090, help="Porta de escuta (9090)")
+    parser.add_argument("--interval", type=int, default=100, help="Intervalo de atualização em ms (100)")
+    args = parser.parse_args()
+    
+    print("=== MT5 TCP Server Emulator v2.00 ===")
+    print("Copyright 2025, PerplexCoder\n")
+    
+    emulator = MT5ServerEmulator(args.host, args.port, update_interval=args.interval / 1000)
+    if not emulator.start():
+        sys.exit(1)
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nInterrompido pelo usuário")
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()